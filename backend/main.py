@@ -3,30 +3,69 @@ Main FastAPI application for Vibe Reverse Engineer Platform
 This application provides CRUD operations for analyzing vibecoded git repositories
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Protocol, AsyncIterator
 import httpx
 import json
+import orjson
 import os
 from datetime import datetime
+from dataclasses import dataclass, field
 import uuid
+import tempfile
+from pathlib import Path
 import re
 import base64
-from urllib.parse import urlparse
+from urllib.parse import urlparse, quote
 import asyncio
 import time
 import logging
+import logging.handlers
+import queue
 from functools import lru_cache
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from cachetools import LRUCache, TTLCache
+from contextlib import asynccontextmanager
+import redis.asyncio as aioredis
+
+# Environment configuration, resolved once at import
+API_VERSION = "1.0.0"
+IS_PROD = os.getenv("ENVIRONMENT", "development") == "production"
+DOCS_URL = None if IS_PROD else "/docs"
+REDOC_URL = None if IS_PROD else "/redoc"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources (GitHub connection pool, analysis processes) on startup and release them on shutdown"""
+    start_queued_logging()
+    await github_client.open()
+    # forkserver children don't inherit the running event loop, threads or sockets; every uvicorn
+    # worker gets its own pool, so size it by the analyses it can actually run at once
+    app.state.analysis_pool = ProcessPoolExecutor(
+        max_workers=min(MAX_CONCURRENT_ANALYSES, os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
+    yield
+    app.state.analysis_pool.shutdown()
+    await github_client.close()
+    await get_store().close()
+    stop_queued_logging()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Vibe Reverse Engineer API",
     description="API for analyzing and reverse engineering vibecoded projects from git repositories",
-    version="1.0.0",
-    docs_url="/docs" if os.getenv("ENVIRONMENT", "development") != "production" else None,
-    redoc_url="/redoc" if os.getenv("ENVIRONMENT", "development") != "production" else None,
+    version=API_VERSION,
+    docs_url=DOCS_URL,
+    redoc_url=REDOC_URL,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration for production and development
@@ -38,13 +77,12 @@ allowed_origins = [
     "http://127.0.0.1:5174",
     "http://127.0.0.1:5175",
     "https://unvibe.vercel.app",
-    "https://unvibe-*.vercel.app",
-    "https://*.vercel.app",
     "https://unvibe.netlify.app",
-    "https://unvibe-*.netlify.app",
-    "https://*.netlify.app"
 ]
 
+# Vercel and Netlify preview deployments; CORSMiddleware does not expand wildcards in allow_origins
+allowed_origin_regex = r"^https://([a-z0-9-]+\.)?(vercel|netlify)\.app$"
+
 # Add production origins from environment variable
 if os.getenv("CORS_ORIGINS"):
     production_origins = os.getenv("CORS_ORIGINS").split(",")
@@ -54,11 +92,36 @@ if os.getenv("CORS_ORIGINS"):
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex=allowed_origin_regex,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
 )
 
+# Compress larger responses such as nested analysis file structures
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Per-request profiling, only enabled with PROFILE set (requires pyinstrument)
+if os.getenv("PROFILE"):
+    from pyinstrument import Profiler
+    from starlette.middleware.base import BaseHTTPMiddleware
+    
+    PROFILE_DIR = Path(os.getenv("PROFILE_DIR", tempfile.gettempdir()))
+    
+    class ProfileMiddleware(BaseHTTPMiddleware):
+        """Profile each request with pyinstrument and write an HTML report to PROFILE_DIR"""
+        
+        async def dispatch(self, request, call_next):
+            profiler = Profiler(interval=0.001, async_mode="enabled")
+            profiler.start()
+            try:
+                return await call_next(request)
+            finally:
+                profiler.stop()
+                (PROFILE_DIR / f"prof-{request.method}-{uuid.uuid4()}.html").write_text(profiler.output_html())
+    
+    app.add_middleware(ProfileMiddleware)
+
 # Health check endpoint for monitoring
 @app.get("/health")
 async def health_check():
@@ -66,7 +129,7 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0",
+        "version": API_VERSION,
         "service": "vibe-api"
     }
 
@@ -76,8 +139,8 @@ async def root():
     """Root endpoint"""
     return {
         "message": "Vibe Reverse Engineer API",
-        "version": "1.0.0",
-        "docs": "/docs" if os.getenv("ENVIRONMENT", "development") != "production" else "Documentation disabled in production"
+        "version": API_VERSION,
+        "docs": DOCS_URL or "Documentation disabled in production"
     }
 
 # Pydantic models for API request/response
@@ -110,21 +173,258 @@ class CreateRepositoryRequest(BaseModel):
     name: str
     description: Optional[str] = None
 
-# In-memory storage (in production, use a database)
-repositories: Dict[str, GitRepository] = {}
-analyses: Dict[str, RepositoryAnalysis] = {}
+class Store(Protocol):
+    """Storage backend for repositories and their analyses"""
+    
+    async def get_repository(self, repository_id: str) -> Optional[GitRepository]: ...
+    
+    async def list_repositories(self) -> List[GitRepository]: ...
+    
+    async def save_repository(self, repository: GitRepository) -> None: ...
+    
+    async def update_repository_status(self, repository_id: str, status: str) -> bool: ...
+    
+    async def delete_repository(self, repository_id: str) -> bool: ...
+    
+    async def get_analysis(self, analysis_id: str) -> Optional[RepositoryAnalysis]: ...
+    
+    def iter_analyses(self) -> AsyncIterator[RepositoryAnalysis]: ...
+    
+    async def list_repository_analyses(self, repository_id: str) -> List[RepositoryAnalysis]: ...
+    
+    async def save_analysis(self, analysis: RepositoryAnalysis) -> None: ...
+    
+    async def close(self) -> None: ...
+
+class InMemoryStore:
+    """Process-local store, suitable for a single worker"""
+    
+    def __init__(self):
+        self.repositories: Dict[str, GitRepository] = {}
+        self.analyses: Dict[str, RepositoryAnalysis] = {}
+        # repository id -> analysis ids (a dict to keep insertion order), so per-repository lookups don't scan every analysis
+        self.analyses_by_repo: defaultdict[str, Dict[str, None]] = defaultdict(dict)
+    
+    async def get_repository(self, repository_id: str) -> Optional[GitRepository]:
+        return self.repositories.get(repository_id)
+    
+    async def list_repositories(self) -> List[GitRepository]:
+        return list(self.repositories.values())
+    
+    async def save_repository(self, repository: GitRepository) -> None:
+        self.repositories[repository.id] = repository
+    
+    async def update_repository_status(self, repository_id: str, status: str) -> bool:
+        """Set the analysis status of an existing repository, returning whether it existed"""
+        repository = self.repositories.get(repository_id)
+        if repository is None:
+            return False
+        repository.analysis_status = status
+        return True
+    
+    async def delete_repository(self, repository_id: str) -> bool:
+        """Delete a repository and its analyses, returning whether it existed"""
+        if self.repositories.pop(repository_id, None) is None:
+            return False
+        
+        for analysis_id in self.analyses_by_repo.pop(repository_id, ()):
+            self.analyses.pop(analysis_id, None)
+        return True
+    
+    async def get_analysis(self, analysis_id: str) -> Optional[RepositoryAnalysis]:
+        return self.analyses.get(analysis_id)
+    
+    async def iter_analyses(self) -> AsyncIterator[RepositoryAnalysis]:
+        # Snapshot so analyses saved while a response is streaming don't break iteration
+        for analysis in list(self.analyses.values()):
+            yield analysis
+    
+    async def list_repository_analyses(self, repository_id: str) -> List[RepositoryAnalysis]:
+        return [self.analyses[analysis_id] for analysis_id in self.analyses_by_repo.get(repository_id, ())]
+    
+    async def save_analysis(self, analysis: RepositoryAnalysis) -> None:
+        self.analyses[analysis.id] = analysis
+        self.analyses_by_repo[analysis.repository_id][analysis.id] = None
+    
+    async def close(self) -> None:
+        pass
+
+class RedisStore:
+    """Redis-backed store shared by every worker process"""
+    
+    REPOSITORIES_KEY = "vibe:repos"
+    # Analysis status lives in its own hash so status updates and repository edits can't overwrite each other
+    STATUSES_KEY = "vibe:repos:status"
+    ANALYSES_KEY = "vibe:analyses"
+    REPOSITORY_ANALYSES_KEY = "vibe:repos:{}:analyses"
+    
+    # Only write the status while the repository still exists, so a late update can't resurrect a deleted one
+    UPDATE_STATUS_SCRIPT = """
+    if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+        redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+        return 1
+    end
+    return 0
+    """
+    
+    def __init__(self, url: str):
+        self.redis = aioredis.Redis.from_url(url)
+        self.update_status_script = self.redis.register_script(self.UPDATE_STATUS_SCRIPT)
+    
+    @staticmethod
+    def _load_repository(raw, status) -> GitRepository:
+        repository = GitRepository.model_validate_json(raw)
+        if status is not None:
+            repository.analysis_status = status.decode()
+        return repository
+    
+    async def get_repository(self, repository_id: str) -> Optional[GitRepository]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hget(self.REPOSITORIES_KEY, repository_id)
+            pipe.hget(self.STATUSES_KEY, repository_id)
+            raw, status = await pipe.execute()
+        return self._load_repository(raw, status) if raw else None
+    
+    async def list_repositories(self) -> List[GitRepository]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(self.REPOSITORIES_KEY)
+            pipe.hgetall(self.STATUSES_KEY)
+            raws, statuses = await pipe.execute()
+        return [self._load_repository(raw, statuses.get(repository_id)) for repository_id, raw in raws.items()]
+    
+    async def save_repository(self, repository: GitRepository) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.REPOSITORIES_KEY, repository.id, repository.model_dump_json())
+            # The initial status is set on creation; afterwards only update_repository_status changes it
+            if repository.analysis_status is not None:
+                pipe.hsetnx(self.STATUSES_KEY, repository.id, repository.analysis_status)
+            await pipe.execute()
+    
+    async def update_repository_status(self, repository_id: str, status: str) -> bool:
+        """Set the analysis status of an existing repository, returning whether it existed"""
+        return bool(await self.update_status_script(keys=[self.REPOSITORIES_KEY, self.STATUSES_KEY], args=[repository_id, status]))
+    
+    async def delete_repository(self, repository_id: str) -> bool:
+        """Delete a repository and its analyses, returning whether it existed"""
+        index_key = self.REPOSITORY_ANALYSES_KEY.format(repository_id)
+        analysis_ids = await self.redis.smembers(index_key)
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(self.REPOSITORIES_KEY, repository_id)
+            pipe.hdel(self.STATUSES_KEY, repository_id)
+            if analysis_ids:
+                pipe.hdel(self.ANALYSES_KEY, *analysis_ids)
+            pipe.delete(index_key)
+            deleted, *_ = await pipe.execute()
+        return bool(deleted)
+    
+    async def get_analysis(self, analysis_id: str) -> Optional[RepositoryAnalysis]:
+        raw = await self.redis.hget(self.ANALYSES_KEY, analysis_id)
+        return RepositoryAnalysis.model_validate_json(raw) if raw else None
+    
+    async def iter_analyses(self) -> AsyncIterator[RepositoryAnalysis]:
+        # HSCAN may return a field more than once while the hash is rehashing
+        seen: Set[bytes] = set()
+        async for analysis_id, raw in self.redis.hscan_iter(self.ANALYSES_KEY):
+            if analysis_id in seen:
+                continue
+            seen.add(analysis_id)
+            yield RepositoryAnalysis.model_validate_json(raw)
+    
+    async def list_repository_analyses(self, repository_id: str) -> List[RepositoryAnalysis]:
+        analysis_ids = await self.redis.smembers(self.REPOSITORY_ANALYSES_KEY.format(repository_id))
+        if not analysis_ids:
+            return []
+        raws = await self.redis.hmget(self.ANALYSES_KEY, list(analysis_ids))
+        # The index is an unordered set; callers expect oldest first, as with the in-memory store
+        analyses = [RepositoryAnalysis.model_validate_json(raw) for raw in raws if raw]
+        return sorted(analyses, key=lambda analysis: analysis.created_at)
+    
+    async def save_analysis(self, analysis: RepositoryAnalysis) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.ANALYSES_KEY, analysis.id, analysis.model_dump_json())
+            pipe.sadd(self.REPOSITORY_ANALYSES_KEY.format(analysis.repository_id), analysis.id)
+            await pipe.execute()
+    
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+@lru_cache
+def get_store() -> Store:
+    """
+    Return the configured store: Redis when REDIS_URL is set, otherwise in-memory
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        return RedisStore(redis_url)
+    return InMemoryStore()
 
 # Configure logging for better debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# While the app is running, records are queued and written by a listener thread
+# so the event loop never blocks on stream I/O
+log_listener: Optional[logging.handlers.QueueListener] = None
+original_root_handlers: List[logging.Handler] = []
+
+def start_queued_logging():
+    """
+    Move the root logger's handlers behind a queue drained by a listener thread
+    The handlers themselves (and whatever formatting the deployment configured) are kept as-is
+    """
+    global log_listener, original_root_handlers
+    if log_listener is not None:
+        return
+    
+    root = logging.getLogger()
+    original_root_handlers = root.handlers[:]
+    log_queue: queue.Queue = queue.Queue(-1)
+    
+    log_listener = logging.handlers.QueueListener(log_queue, *original_root_handlers, respect_handler_level=True)
+    for handler in original_root_handlers:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener.start()
+
+def stop_queued_logging():
+    """
+    Flush the listener and give the root logger its original handlers back
+    """
+    global log_listener, original_root_handlers
+    if log_listener is None:
+        return
+    
+    # Reattach the originals before detaching the queue so no record is dropped in between
+    root = logging.getLogger()
+    for handler in original_root_handlers:
+        root.addHandler(handler)
+    for handler in root.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    
+    log_listener.stop()
+    log_listener = None
+    original_root_handlers = []
+
 # GitHub API configuration with authentication
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_API_BASE = "https://api.github.com"
 
 # Rate limiting configuration
-RATE_LIMIT_DELAY = 1.2  # Seconds between API calls
 MAX_RETRIES = 3
+ETAG_CACHE_SIZE = 1024  # Repository metadata responses kept for conditional requests
+
+# Analysis cache configuration
+ANALYSIS_CACHE_SIZE = 1024
+ANALYSIS_CACHE_TTL = 3600  # Seconds
+
+# Limit on background analyses running at once; extra requests wait in "pending"
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "8"))
+ANALYSIS_SEM = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+# Completed analyses keyed by (owner, repo, pushed_at) so unchanged repositories skip the crawl
+analysis_cache: TTLCache = TTLCache(maxsize=ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL)
 
 class GitHubAPIClient:
     """Enhanced GitHub API client with authentication and rate limiting"""
@@ -132,17 +432,40 @@ class GitHubAPIClient:
     def __init__(self):
         self.token = GITHUB_TOKEN
         self.headers = self._build_headers()
-        self.last_request_time = 0
+        # Budget reported by GitHub's X-RateLimit-* headers on the latest response
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset = 0
+        self.client: Optional[httpx.AsyncClient] = None
+        # URL -> (ETag, parsed body) so unchanged resources come back as empty 304s
+        self.etag_cache: LRUCache = LRUCache(maxsize=ETAG_CACHE_SIZE)
+    
+    async def open(self) -> httpx.AsyncClient:
+        """Open the pooled client so keep-alive connections are reused across requests"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                base_url=GITHUB_API_BASE,
+                headers=self.headers,
+                http2=True,
+                timeout=httpx.Timeout(10.0, connect=5.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            )
+        return self.client
+    
+    async def close(self):
+        """Close the pooled client and its open connections"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
     
     def _build_headers(self) -> Dict[str, str]:
         """Build headers for GitHub API requests with authentication"""
         headers = {
-            "Accept": "application/vnd.github.v3+json",
+            "Accept": "application/vnd.github+json",
             "User-Agent": "Vibe-Analysis-Platform/1.0"
         }
         
         if self.token:
-            headers["Authorization"] = f"token {self.token}"
+            headers["Authorization"] = f"Bearer {self.token}"
             logger.info("GitHub API client initialized with authentication")
         else:
             logger.warning("GitHub API client initialized WITHOUT authentication - rate limits will apply")
@@ -151,52 +474,83 @@ class GitHubAPIClient:
     
     async def _rate_limit_delay(self):
         """Implement rate limiting to avoid API limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < RATE_LIMIT_DELAY:
-            await asyncio.sleep(RATE_LIMIT_DELAY - time_since_last)
-        
-        self.last_request_time = time.time()
+        # Only wait once GitHub reports the budget as spent; concurrency is bounded by the callers
+        if self.rate_limit_remaining is not None and self.rate_limit_remaining <= 0:
+            wait_time = self.rate_limit_reset - time.time()
+            if wait_time > 0:
+                logger.warning(f"Rate limit budget exhausted. Waiting {int(wait_time)} seconds...")
+                await asyncio.sleep(wait_time)
+            self.rate_limit_remaining = None
     
-    async def make_request(self, url: str, timeout: int = 30) -> Optional[Dict]:
-        """Make authenticated request to GitHub API with retry logic"""
+    def _record_rate_limit(self, response: httpx.Response):
+        """Remember the rate-limit budget GitHub reported on a response"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            self.rate_limit_remaining = int(remaining)
+            self.rate_limit_reset = int(reset)
+    
+    async def make_request(self, url: str, timeout: Optional[float] = None, conditional: bool = False) -> Optional[Dict]:
+        """
+        Make authenticated request to GitHub API with retry logic
+        Conditional requests keep the body and ETag so a later 304 can reuse them; only use it for small responses
+        """
         await self._rate_limit_delay()
+        client = await self.open()
+        
+        cached = self.etag_cache.get(url) if conditional else None
+        headers = {"If-None-Match": cached[0]} if cached else None
         
         for attempt in range(MAX_RETRIES):
             try:
-                timeout_config = httpx.Timeout(timeout)
-                async with httpx.AsyncClient(timeout=timeout_config) as client:
-                    logger.info(f"Making GitHub API request: {url} (attempt {attempt + 1})")
-                    
-                    response = await client.get(url, headers=self.headers)
-                    
-                    # Check rate limiting
-                    if response.status_code == 403:
-                        rate_limit_remaining = response.headers.get('X-RateLimit-Remaining', '0')
-                        if rate_limit_remaining == '0':
-                            reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                            current_time = int(time.time())
-                            wait_time = max(reset_time - current_time, 60)
-                            
-                            logger.warning(f"Rate limit exceeded. Waiting {wait_time} seconds...")
-                            await asyncio.sleep(wait_time)
-                            continue
-                    
-                    if response.status_code == 200:
-                        logger.info(f"Successful API response: {url}")
-                        return response.json()
-                    
-                    elif response.status_code == 404:
-                        logger.warning(f"Resource not found: {url}")
+                logger.info(f"Making GitHub API request: {url} (attempt {attempt + 1})")
+                
+                response = await client.get(
+                    url,
+                    headers=headers,
+                    timeout=httpx.Timeout(timeout, connect=5.0) if timeout else httpx.USE_CLIENT_DEFAULT,
+                )
+                self._record_rate_limit(response)
+                
+                # Check rate limiting
+                if response.status_code == 403:
+                    rate_limit_remaining = response.headers.get('X-RateLimit-Remaining', '0')
+                    if rate_limit_remaining == '0':
+                        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+                        current_time = int(time.time())
+                        wait_time = max(reset_time - current_time, 60)
+                        
+                        logger.warning(f"Rate limit exceeded. Waiting {wait_time} seconds...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                
+                if response.status_code == 304 and cached:
+                    logger.info(f"Not modified, using cached response: {url}")
+                    return cached[1]
+                
+                if response.status_code == 200:
+                    logger.info(f"Successful API response: {url}")
+                    data = orjson.loads(response.content)
+                    etag = response.headers.get('ETag')
+                    if conditional and etag:
+                        self.etag_cache[url] = (etag, data)
+                    return data
+                
+                elif response.status_code == 404:
+                    logger.warning(f"Resource not found: {url}")
+                    return None
+                
+                elif response.status_code == 409:
+                    # GitHub answers git endpoints of empty repositories with 409; retrying won't help
+                    logger.warning(f"Repository is empty: {url}")
+                    return None
+                
+                else:
+                    logger.error(f"API request failed: {url} - Status: {response.status_code}")
+                    if attempt == MAX_RETRIES - 1:
                         return None
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
                     
-                    else:
-                        logger.error(f"API request failed: {url} - Status: {response.status_code}")
-                        if attempt == MAX_RETRIES - 1:
-                            return None
-                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                        
             except httpx.TimeoutException:
                 logger.error(f"Timeout for request: {url} (attempt {attempt + 1})")
                 if attempt == MAX_RETRIES - 1:
@@ -215,24 +569,26 @@ class GitHubAPIClient:
 github_client = GitHubAPIClient()
 
 @app.get("/repositories", response_model=List[GitRepository])
-async def get_repositories():
+async def get_repositories(store: Store = Depends(get_store)):
     """
     Get all repositories
     Returns a list of all registered repositories
     """
-    return list(repositories.values())
+    # Stored models are already validated, so skip response_model revalidation
+    return ORJSONResponse([repository.model_dump(mode="json") for repository in await store.list_repositories()])
 
 @app.get("/repositories/{repository_id}", response_model=GitRepository)
-async def get_repository(repository_id: str):
+async def get_repository(repository_id: str, store: Store = Depends(get_store)):
     """
     Get a specific repository by ID
     """
-    if repository_id not in repositories:
+    repository = await store.get_repository(repository_id)
+    if repository is None:
         raise HTTPException(status_code=404, detail="Repository not found")
-    return repositories[repository_id]
+    return repository
 
 @app.post("/repositories", response_model=GitRepository)
-async def create_repository(request: CreateRepositoryRequest, background_tasks: BackgroundTasks):
+async def create_repository(request: CreateRepositoryRequest, background_tasks: BackgroundTasks, store: Store = Depends(get_store)):
     """
     Create a new repository for analysis
     This endpoint registers a new git repository and starts background analysis
@@ -250,73 +606,77 @@ async def create_repository(request: CreateRepositoryRequest, background_tasks:
         updated_at=datetime.now()
     )
     
-    repositories[repository_id] = repository
+    await store.save_repository(repository)
     
     # Start background analysis
-    background_tasks.add_task(analyze_repository, repository_id, str(request.url))
+    background_tasks.add_task(analyze_repository, repository_id, str(request.url), store)
     
     return repository
 
 @app.put("/repositories/{repository_id}", response_model=GitRepository)
-async def update_repository(repository_id: str, request: CreateRepositoryRequest):
+async def update_repository(repository_id: str, request: CreateRepositoryRequest, store: Store = Depends(get_store)):
     """
     Update an existing repository
     """
-    if repository_id not in repositories:
+    repository = await store.get_repository(repository_id)
+    if repository is None:
         raise HTTPException(status_code=404, detail="Repository not found")
     
-    repository = repositories[repository_id]
-    repository.url = request.url
-    repository.name = request.name
-    repository.description = request.description
-    repository.updated_at = datetime.now()
+    # The request body is already validated, so copy the changes over in one step
+    repository = repository.model_copy(update={
+        "url": request.url,
+        "name": request.name,
+        "description": request.description,
+        "updated_at": datetime.now(),
+    })
     
-    repositories[repository_id] = repository
+    await store.save_repository(repository)
     return repository
 
 @app.delete("/repositories/{repository_id}")
-async def delete_repository(repository_id: str):
+async def delete_repository(repository_id: str, store: Store = Depends(get_store)):
     """
     Delete a repository and its associated analyses
     """
-    if repository_id not in repositories:
+    if not await store.delete_repository(repository_id):
         raise HTTPException(status_code=404, detail="Repository not found")
     
-    # Delete associated analyses
-    analyses_to_delete = [analysis_id for analysis_id, analysis in analyses.items() 
-                         if analysis.repository_id == repository_id]
-    for analysis_id in analyses_to_delete:
-        del analyses[analysis_id]
-    
-    # Delete repository
-    del repositories[repository_id]
-    
     return {"message": "Repository deleted successfully"}
 
 @app.get("/analyses", response_model=List[RepositoryAnalysis])
-async def get_analyses():
+async def get_analyses(store: Store = Depends(get_store)):
     """
     Get all repository analyses
+    Streamed one analysis at a time so memory stays flat however many there are
     """
-    return list(analyses.values())
+    async def stream_analyses():
+        yield b"["
+        first = True
+        async for analysis in store.iter_analyses():
+            if not first:
+                yield b","
+            yield orjson.dumps(analysis.model_dump(mode="json"))
+            first = False
+        yield b"]"
+    
+    return StreamingResponse(stream_analyses(), media_type="application/json")
 
 @app.get("/analyses/repository/{repository_id}", response_model=List[RepositoryAnalysis])
-async def get_analyses_by_repository(repository_id: str):
+async def get_analyses_by_repository(repository_id: str, store: Store = Depends(get_store)):
     """
     Get all analyses for a specific repository
     """
-    repository_analyses = [analysis for analysis in analyses.values() 
-                          if analysis.repository_id == repository_id]
-    return repository_analyses
+    return ORJSONResponse([analysis.model_dump(mode="json") for analysis in await store.list_repository_analyses(repository_id)])
 
 @app.get("/analyses/{analysis_id}", response_model=RepositoryAnalysis)
-async def get_analysis(analysis_id: str):
+async def get_analysis(analysis_id: str, store: Store = Depends(get_store)):
     """
     Get a specific analysis by ID
     """
-    if analysis_id not in analyses:
+    analysis = await store.get_analysis(analysis_id)
+    if analysis is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
-    return analyses[analysis_id]
+    return analysis
 
 async def analyze_github_repository(owner: str, repo_name: str):
     """
@@ -326,8 +686,9 @@ async def analyze_github_repository(owner: str, repo_name: str):
         logger.info(f"Starting enhanced analysis for {owner}/{repo_name}")
         
         # Get repository information
-        repo_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo_name}"
-        repo_data = await github_client.make_request(repo_url)
+        repo_url = f"/repos/{owner}/{repo_name}"
+        # Trees are not cached: analysis_cache already covers unchanged repositories
+        repo_data = await github_client.make_request(repo_url, conditional=True)
         
         if not repo_data:
             logger.error(f"Failed to fetch repository data for {owner}/{repo_name}")
@@ -335,94 +696,144 @@ async def analyze_github_repository(owner: str, repo_name: str):
         
         logger.info(f"Repository data retrieved: {repo_data.get('name')}, Language: {repo_data.get('language')}")
         
-        # Get repository contents
-        contents_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo_name}/contents"
-        contents_data = await github_client.make_request(contents_url)
-        
-        if not contents_data:
-            logger.warning(f"Repository contents not accessible for {owner}/{repo_name}")
-            return await create_minimal_analysis(repo_data, "Repository contents not accessible")
+        # Reuse the previous analysis if nothing has been pushed since
+        cache_key = (owner.lower(), repo_name.lower(), repo_data.get('pushed_at'))
+        cached_analysis = analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            logger.info(f"Using cached analysis for {owner}/{repo_name}")
+            return cached_analysis
         
-        logger.info(f"Repository contents retrieved: {len(contents_data)} items")
+        # Get the full repository tree in a single request
+        default_branch = repo_data.get('default_branch') or 'HEAD'
+        tree_url = f"/repos/{owner}/{repo_name}/git/trees/{quote(default_branch, safe='')}?recursive=1"
+        tree_data = await github_client.make_request(tree_url, timeout=30)  # Large trees can take a while
         
-        # Build file structure using authenticated client
-        file_structure = await build_file_structure_authenticated(owner, repo_name, contents_data)
-        logger.info(f"File structure built with {len(file_structure)} root items")
+        # Empty repositories answer with 409, which make_request turns into None without retrying
+        if not tree_data or not tree_data.get('tree'):
+            logger.warning(f"Repository empty or contents not accessible for {owner}/{repo_name}")
+            return await create_minimal_analysis(repo_data, "Repository is empty or its contents are not accessible")
         
-        # Use existing technology detection
-        technologies_detected = detect_technologies(file_structure, repo_data)
-        logger.info(f"Technologies detected: {technologies_detected}")
+        if tree_data.get('truncated'):
+            logger.warning(f"Repository tree for {owner}/{repo_name} was truncated by GitHub")
         
-        # Use existing pattern analysis
-        vibe_patterns = analyze_code_patterns(file_structure, technologies_detected)
+        logger.info(f"Repository tree retrieved: {len(tree_data['tree'])} entries")
         
-        # Use existing recommendations
-        recommendations = generate_recommendations(file_structure, technologies_detected, repo_data)
+        file_structure = build_file_structure(tree_data['tree'])
+        logger.info(f"File structure built with {len(file_structure)} root items")
         
-        # Use existing complexity scoring
-        complexity_score = calculate_complexity_score(file_structure, technologies_detected, repo_data)
+        # Run the CPU-bound passes off the event loop (default thread pool if started without the lifespan)
+        loop = asyncio.get_running_loop()
+        technologies_detected, vibe_patterns, recommendations, complexity_score = await loop.run_in_executor(
+            getattr(app.state, "analysis_pool", None), analyze_file_structure, file_structure, repo_data
+        )
+        logger.info(f"Technologies detected: {technologies_detected}")
         
         logger.info(f"Analysis completed successfully for {owner}/{repo_name}. Complexity: {complexity_score}")
-        return file_structure, technologies_detected, vibe_patterns, recommendations, complexity_score
+        result = (file_structure, technologies_detected, vibe_patterns, recommendations, complexity_score)
+        analysis_cache[cache_key] = result
+        return result
         
     except Exception as e:
-        logger.error(f"Critical error analyzing {owner}/{repo_name}: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"Critical error analyzing {owner}/{repo_name}: {str(e)}")
         return await create_fallback_analysis(repo_name, f"Analysis failed: {str(e)}")
 
-async def build_file_structure_authenticated(owner: str, repo_name: str, contents, path=""):
+def build_file_structure(tree_entries):
     """
-    Recursively build file structure from GitHub API using authenticated client
+    Build nested file structure from a recursive git tree listing
     """
     structure = {}
     
-    for item in contents[:20]:  # Limit to avoid API rate limits
-        if item['type'] == 'dir':
-            try:
-                # Get directory contents using authenticated client
-                dir_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo_name}/contents/{item['path']}"
-                dir_contents = await github_client.make_request(dir_url)
-                
-                if dir_contents and isinstance(dir_contents, list):
-                    structure[f"{item['name']}/"] = await build_file_structure_authenticated(owner, repo_name, dir_contents[:10], item['path'])
-                else:
-                    structure[f"{item['name']}/"] = []
-            except Exception as e:
-                logger.warning(f"Failed to access directory {item['name']}: {str(e)}")
-                structure[f"{item['name']}/"] = []
+    for entry in tree_entries:
+        *parents, name = entry['path'].split('/')
+        
+        node = structure
+        for parent in parents:
+            node = node.setdefault(f"{parent}/", {})
+        
+        if entry['type'] == 'tree':
+            node.setdefault(f"{name}/", {})
         else:
-            structure[item['name']] = f"{item.get('size', 0)} bytes"
+            node[name] = f"{entry.get('size', 0)} bytes"
     
     return structure
 
-async def build_file_structure(client: httpx.AsyncClient, owner: str, repo_name: str, contents, path=""):
+# Name fragments the analysis checks for anywhere in the tree (matched case-insensitively)
+FILE_MARKERS = ('docker', 'dockerfile', '.env', 'readme', 'eslint', 'prettier', 'package.json')
+
+@dataclass
+class RepoSummary:
+    """Flattened view of a file structure used by the analysis functions"""
+    files: Set[str] = field(default_factory=set)
+    dirs_lower: Set[str] = field(default_factory=set)
+    markers: Set[str] = field(default_factory=set)
+    file_count: int = 0
+
+def summarize(file_structure) -> RepoSummary:
     """
-    Recursively build file structure from GitHub API
+    Walk the file structure once, collecting file names, directory names and the file count
     """
-    structure = {}
+    summary = RepoSummary()
     
-    for item in contents[:20]:  # Limit to avoid API rate limits
-        if item['type'] == 'dir':
-            try:
-                # Get directory contents
-                dir_response = await client.get(f"https://api.github.com/repos/{owner}/{repo_name}/contents/{item['path']}")
-                if dir_response.status_code == 200:
-                    dir_contents = dir_response.json()
-                    if isinstance(dir_contents, list):
-                        structure[f"{item['name']}/"] = await build_file_structure(client, owner, repo_name, dir_contents[:10], item['path'])
-                    else:
-                        structure[f"{item['name']}/"] = []
-                else:
-                    structure[f"{item['name']}/"] = []
-            except:
-                structure[f"{item['name']}/"] = []
-        else:
-            structure[item['name']] = f"{item.get('size', 0)} bytes"
+    stack = [file_structure]
+    while stack:
+        structure = stack.pop()
+        for name, content in structure.items():
+            if isinstance(content, dict):
+                summary.dirs_lower.add(name.rstrip('/').lower())
+                stack.append(content)
+            else:
+                summary.files.add(name)
+                summary.file_count += 1
     
-    return structure
+    # Resolve the substring checks once so each predicate is a set lookup
+    names_lower = summary.dirs_lower | {name.lower() for name in summary.files}
+    summary.markers = {marker for marker in FILE_MARKERS if any(marker in name for name in names_lower)}
+    
+    return summary
+
+# Technologies implied by a file extension
+EXT_TO_TECHS: Dict[str, tuple] = {
+    '.tsx': ('React', 'JavaScript'),
+    '.jsx': ('React', 'JavaScript'),
+    '.ts': ('TypeScript',),
+    '.vue': ('Vue.js',),
+    '.py': ('Python',),
+    '.java': ('Java',),
+    '.go': ('Go',),
+    '.rs': ('Rust',),
+    '.php': ('PHP',),
+    '.rb': ('Ruby',),
+    '.swift': ('Swift',),
+    '.kt': ('Kotlin',),
+    '.dart': ('Dart',),
+}
 
-def detect_technologies(file_structure, repo_data):
+# Technologies implied by a well-known file name
+NAME_TO_TECHS: Dict[str, tuple] = {
+    'package.json': ('Node.js', 'npm'),
+    'Cargo.toml': ('Rust',),
+    'requirements.txt': ('Python',),
+    'pyproject.toml': ('Python',),
+    'pom.xml': ('Java',),
+    'build.gradle': ('Java',),
+    'Gemfile': ('Ruby',),
+    'composer.json': ('PHP',),
+    'pubspec.yaml': ('Dart', 'Flutter'),
+    'vite.config.ts': ('Vite',),
+    'vite.config.js': ('Vite',),
+    'webpack.config.js': ('Webpack',),
+    'tailwind.config.js': ('Tailwind CSS',),
+    'next.config.js': ('Next.js',),
+    'nuxt.config.js': ('Nuxt.js',),
+    'angular.json': ('Angular',),
+    'vue.config.js': ('Vue.js',),
+    'svelte.config.js': ('Svelte',),
+    'Dockerfile': ('Docker',),
+    'docker-compose.yml': ('Docker Compose',),
+    '.github': ('GitHub Actions',),
+}
+
+def detect_technologies(summary: RepoSummary, repo_data):
     """
     Detect technologies based on file extensions and structure
     """
@@ -432,125 +843,47 @@ def detect_technologies(file_structure, repo_data):
     if repo_data.get('language'):
         technologies.add(repo_data['language'])
     
-    # Detect from file structure
-    def scan_files(structure):
-        for name, content in structure.items():
-            if isinstance(content, dict):
-                scan_files(content)
-            else:
-                # File extensions
-                if name.endswith('.tsx') or name.endswith('.jsx'):
-                    technologies.update(['React', 'JavaScript'])
-                elif name.endswith('.ts'):
-                    technologies.add('TypeScript')
-                elif name.endswith('.vue'):
-                    technologies.add('Vue.js')
-                elif name.endswith('.py'):
-                    technologies.add('Python')
-                elif name.endswith('.java'):
-                    technologies.add('Java')
-                elif name.endswith('.go'):
-                    technologies.add('Go')
-                elif name.endswith('.rs'):
-                    technologies.add('Rust')
-                elif name.endswith('.php'):
-                    technologies.add('PHP')
-                elif name.endswith('.rb'):
-                    technologies.add('Ruby')
-                elif name.endswith('.swift'):
-                    technologies.add('Swift')
-                elif name.endswith('.kt'):
-                    technologies.add('Kotlin')
-                elif name.endswith('.dart'):
-                    technologies.add('Dart')
-                
-                # Framework detection
-                if name == 'package.json':
-                    technologies.update(['Node.js', 'npm'])
-                elif name == 'Cargo.toml':
-                    technologies.add('Rust')
-                elif name == 'requirements.txt' or name == 'pyproject.toml':
-                    technologies.add('Python')
-                elif name == 'pom.xml' or name == 'build.gradle':
-                    technologies.add('Java')
-                elif name == 'Gemfile':
-                    technologies.add('Ruby')
-                elif name == 'composer.json':
-                    technologies.add('PHP')
-                elif name == 'pubspec.yaml':
-                    technologies.update(['Dart', 'Flutter'])
-                elif name == 'vite.config.ts' or name == 'vite.config.js':
-                    technologies.add('Vite')
-                elif name == 'webpack.config.js':
-                    technologies.add('Webpack')
-                elif name == 'tailwind.config.js':
-                    technologies.add('Tailwind CSS')
-                elif name == 'next.config.js':
-                    technologies.add('Next.js')
-                elif name == 'nuxt.config.js':
-                    technologies.add('Nuxt.js')
-                elif name == 'angular.json':
-                    technologies.add('Angular')
-                elif name == 'vue.config.js':
-                    technologies.add('Vue.js')
-                elif name == 'svelte.config.js':
-                    technologies.add('Svelte')
-                elif name == 'Dockerfile':
-                    technologies.add('Docker')
-                elif name == 'docker-compose.yml':
-                    technologies.add('Docker Compose')
-                elif name == '.github':
-                    technologies.add('GitHub Actions')
-    
-    scan_files(file_structure)
+    # Detect from file names
+    for name in summary.files:
+        technologies.update(EXT_TO_TECHS.get(os.path.splitext(name)[1], ()))
+        technologies.update(NAME_TO_TECHS.get(name, ()))
+    
     return list(technologies)
 
-def analyze_code_patterns(file_structure, technologies):
+def analyze_code_patterns(summary: RepoSummary, technologies):
     """
     Analyze code patterns based on file structure and technologies
     """
     patterns = []
-    
-    # Check for common patterns
-    def has_directory(name):
-        return any(name in str(key) for key in file_structure.keys())
-    
-    def has_file(name):
-        def search_structure(structure):
-            for key, value in structure.items():
-                if name in key:
-                    return True
-                if isinstance(value, dict) and search_structure(value):
-                    return True
-            return False
-        return search_structure(file_structure)
+    dirs = summary.dirs_lower
+    markers = summary.markers
     
     # Architecture patterns
-    if has_directory('components'):
+    if 'components' in dirs:
         patterns.append('Component-based architecture')
-    if has_directory('pages') or has_directory('views'):
+    if 'pages' in dirs or 'views' in dirs:
         patterns.append('Page-based routing')
-    if has_directory('hooks'):
+    if 'hooks' in dirs:
         patterns.append('Custom hooks pattern')
-    if has_directory('services') or has_directory('api'):
+    if 'services' in dirs or 'api' in dirs:
         patterns.append('Service layer architecture')
-    if has_directory('utils') or has_directory('helpers'):
+    if 'utils' in dirs or 'helpers' in dirs:
         patterns.append('Utility functions organization')
-    if has_directory('models') or has_directory('entities'):
+    if 'models' in dirs or 'entities' in dirs:
         patterns.append('Data modeling patterns')
-    if has_directory('controllers'):
+    if 'controllers' in dirs:
         patterns.append('MVC architecture')
-    if has_directory('middleware'):
+    if 'middleware' in dirs:
         patterns.append('Middleware pattern')
-    if has_directory('store') or has_directory('redux'):
+    if 'store' in dirs or 'redux' in dirs:
         patterns.append('State management patterns')
-    if has_directory('tests') or has_directory('__tests__'):
+    if 'tests' in dirs or '__tests__' in dirs:
         patterns.append('Test-driven development')
-    if has_file('docker'):
+    if 'docker' in markers:
         patterns.append('Containerization patterns')
-    if has_file('.env'):
+    if '.env' in markers:
         patterns.append('Environment configuration')
-    if has_file('README'):
+    if 'readme' in markers:
         patterns.append('Documentation practices')
     
     # Technology-specific patterns
@@ -567,43 +900,32 @@ def analyze_code_patterns(file_structure, technologies):
     
     return patterns
 
-def generate_recommendations(file_structure, technologies, repo_data):
+def generate_recommendations(summary: RepoSummary, technologies, repo_data):
     """
     Generate recommendations based on actual repository analysis
     """
     recommendations = []
-    
-    def has_directory(name):
-        return any(name in str(key) for key in file_structure.keys())
-    
-    def has_file(name):
-        def search_structure(structure):
-            for key, value in structure.items():
-                if name in key:
-                    return True
-                if isinstance(value, dict) and search_structure(value):
-                    return True
-            return False
-        return search_structure(file_structure)
+    dirs = summary.dirs_lower
+    markers = summary.markers
     
     # Testing recommendations
-    if not has_directory('test') and not has_directory('__tests__'):
+    if not {'test', 'tests', '__tests__'} & dirs:
         recommendations.append('Add unit tests to improve code reliability')
     
     # Documentation
-    if not has_file('README'):
+    if 'readme' not in markers:
         recommendations.append('Add a comprehensive README.md file')
     
     # CI/CD
-    if not has_directory('.github'):
+    if '.github' not in dirs:
         recommendations.append('Set up GitHub Actions for CI/CD')
     
     # Environment
-    if not has_file('.env') and ('Node.js' in technologies or 'Python' in technologies):
+    if '.env' not in markers and ('Node.js' in technologies or 'Python' in technologies):
         recommendations.append('Add environment configuration files')
     
     # Docker
-    if not has_file('Dockerfile') and len(technologies) > 2:
+    if 'dockerfile' not in markers and len(technologies) > 2:
         recommendations.append('Consider containerizing the application with Docker')
     
     # Type safety
@@ -612,13 +934,13 @@ def generate_recommendations(file_structure, technologies, repo_data):
     
     # Code quality
     if 'JavaScript' in technologies or 'TypeScript' in technologies:
-        if not has_file('eslint'):
+        if 'eslint' not in markers:
             recommendations.append('Add ESLint for code quality enforcement')
-        if not has_file('prettier'):
+        if 'prettier' not in markers:
             recommendations.append('Add Prettier for consistent code formatting')
     
     # Security
-    if has_file('package.json'):
+    if 'package.json' in markers:
         recommendations.append('Regular dependency updates and security audits')
     
     # Performance
@@ -631,15 +953,14 @@ def generate_recommendations(file_structure, technologies, repo_data):
     
     return recommendations
 
-def calculate_complexity_score(file_structure, technologies, repo_data):
+def calculate_complexity_score(summary: RepoSummary, technologies, repo_data):
     """
     Calculate complexity score based on actual repository metrics
     """
     score = 1.0
     
     # Base complexity from file count
-    file_count = count_files(file_structure)
-    score += min(3.0, file_count / 20)  # Max 3 points for file count
+    score += min(3.0, summary.file_count / 20)  # Max 3 points for file count
     
     # Technology diversity
     score += min(2.0, len(technologies) / 5)  # Max 2 points for tech diversity
@@ -662,17 +983,20 @@ def calculate_complexity_score(file_structure, technologies, repo_data):
     
     return round(min(10.0, score), 1)
 
-def count_files(structure):
+def analyze_file_structure(file_structure, repo_data):
     """
-    Count total files in the structure
+    Run every analysis pass over a file structure
+    Kept at module level so it can be sent to the analysis process pool
     """
-    count = 0
-    for key, value in structure.items():
-        if isinstance(value, dict):
-            count += count_files(value)
-        else:
-            count += 1
-    return count
+    # Summarize the tree once for all of the analysis passes
+    summary = summarize(file_structure)
+    
+    technologies_detected = detect_technologies(summary, repo_data)
+    vibe_patterns = analyze_code_patterns(summary, technologies_detected)
+    recommendations = generate_recommendations(summary, technologies_detected, repo_data)
+    complexity_score = calculate_complexity_score(summary, technologies_detected, repo_data)
+    
+    return technologies_detected, vibe_patterns, recommendations, complexity_score
 
 async def create_minimal_analysis(repo_data, error_message="Repository content not accessible"):
     """
@@ -698,70 +1022,76 @@ async def create_fallback_analysis(repo_name, error_message="Analysis failed due
         1.0
     )
 
-async def analyze_repository(repository_id: str, repository_url: str):
+async def analyze_repository(repository_id: str, repository_url: str, store: Store):
     """
     Background task to analyze a git repository using GitHub API
     This function fetches real repository data and performs actual analysis
     """
-    try:
-        print(f"Starting repository analysis for {repository_id} - {repository_url}")
-        
-        # Update repository status
-        if repository_id in repositories:
-            repositories[repository_id].analysis_status = "analyzing"
-        
-        # Parse GitHub URL
-        parsed_url = urlparse(repository_url)
-        print(f"Parsed URL: {parsed_url}")
-        
-        if 'github.com' not in parsed_url.netloc:
-            raise ValueError("Only GitHub repositories are supported")
-        
-        # Extract owner and repo name from URL
-        path_parts = parsed_url.path.strip('/').split('/')
-        print(f"Path parts: {path_parts}")
-        
-        if len(path_parts) < 2:
-            raise ValueError("Invalid GitHub repository URL")
-        
-        owner = path_parts[0]
-        repo_name = path_parts[1].replace('.git', '')  # Remove .git suffix if present
-        
-        print(f"Extracted owner: {owner}, repo: {repo_name}")
-        
-        # Analyze repository using GitHub API
-        file_structure, technologies_detected, vibe_patterns, recommendations, complexity_score = await analyze_github_repository(owner, repo_name)
-        
-        print(f"Analysis completed. Creating record...")
-        
-        # Create analysis record
-        analysis_id = str(uuid.uuid4())
-        analysis = RepositoryAnalysis(
-            id=analysis_id,
-            repository_id=repository_id,
-            file_structure=file_structure,
-            technologies_detected=technologies_detected,
-            complexity_score=complexity_score,
-            vibe_patterns=vibe_patterns,
-            recommendations=recommendations,
-            created_at=datetime.now()
-        )
-        
-        analyses[analysis_id] = analysis
-        
-        # Update repository status
-        if repository_id in repositories:
-            repositories[repository_id].analysis_status = "completed"
-            print(f"Repository {repository_id} analysis completed successfully")
+    async with ANALYSIS_SEM:
+        try:
+            logger.info(f"Starting repository analysis for {repository_id} - {repository_url}")
             
-    except Exception as e:
-        # Update repository status to failed
-        if repository_id in repositories:
-            repositories[repository_id].analysis_status = "failed"
-        print(f"Analysis failed for repository {repository_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+            # Update repository status
+            await store.update_repository_status(repository_id, "analyzing")
+            
+            # Parse GitHub URL
+            parsed_url = urlparse(repository_url)
+            logger.info(f"Parsed URL: {parsed_url}")
+            
+            if 'github.com' not in parsed_url.netloc:
+                raise ValueError("Only GitHub repositories are supported")
+            
+            # Extract owner and repo name from URL
+            path_parts = parsed_url.path.strip('/').split('/')
+            logger.info(f"Path parts: {path_parts}")
+            
+            if len(path_parts) < 2:
+                raise ValueError("Invalid GitHub repository URL")
+            
+            owner = path_parts[0]
+            repo_name = path_parts[1].replace('.git', '')  # Remove .git suffix if present
+            
+            logger.info(f"Extracted owner: {owner}, repo: {repo_name}")
+            
+            # Analyze repository using GitHub API
+            file_structure, technologies_detected, vibe_patterns, recommendations, complexity_score = await analyze_github_repository(owner, repo_name)
+            
+            logger.info("Analysis completed. Creating record...")
+            
+            # Create analysis record
+            analysis_id = str(uuid.uuid4())
+            analysis = RepositoryAnalysis(
+                id=analysis_id,
+                repository_id=repository_id,
+                file_structure=file_structure,
+                technologies_detected=technologies_detected,
+                complexity_score=complexity_score,
+                vibe_patterns=vibe_patterns,
+                recommendations=recommendations,
+                created_at=datetime.now()
+            )
+            
+            await store.save_analysis(analysis)
+            
+            # Update repository status
+            await store.update_repository_status(repository_id, "completed")
+            logger.info(f"Repository {repository_id} analysis completed successfully")
+                
+        except Exception as e:
+            # Update repository status to failed
+            await store.update_repository_status(repository_id, "failed")
+            logger.exception(f"Analysis failed for repository {repository_id}: {str(e)}")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        # In-memory storage is per process, so only scale out with REDIS_URL set
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )